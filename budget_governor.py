@@ -0,0 +1,205 @@
+import json
+import time
+from collections import Counter
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.errors import GraphRecursionError
+from langgraph.graph import END
+
+
+# 요청 단위 예산 관리자
+# agent ↔ tools 루프나 Alice ↔ Bob 핸드오프가 기본 recursion limit까지 반복되며
+# LLM 호출을 낭비하지 않도록, 예산을 넘거나 반복이 감지되면 실행을 멈추고
+# 에러 대신 지금까지의 결과로 최선의 답변을 돌려줍니다.
+
+FALLBACK_ANSWER = "요청을 처리하는 중 실행 예산을 초과하여 작업을 중단했습니다. 질문을 조금 더 구체적으로 다시 요청해주세요."
+
+FINAL_ANSWER_PROMPT = "실행 예산이 초과되어 더 이상 도구를 사용할 수 없습니다. 지금까지 얻은 도구 결과만으로 사용자 질문에 최선의 답변을 작성하세요."
+
+MAX_TOOL_OUTPUTS = 3  # 모델 없이 답변을 만들 때 포함할 최근 도구 결과 수
+
+
+class StepBudget:
+    """요청 하나에 허용되는 실행 예산입니다.
+
+    Args:
+        max_steps: 최상위 그래프의 최대 superstep 수 (각 그래프의 recursion_limit으로도 적용)
+            서브그래프 안의 루프는 max_llm_calls와 반복 호출 감지로 제한합니다.
+        max_llm_calls: 최대 LLM 호출 수
+        max_tokens: 최대 사용 토큰 수
+        max_seconds: 최대 실행 시간(초). superstep 사이에서만 검사하므로 실행 중인 LLM/도구 호출 하나가
+            멈춘 경우는 끊지 못합니다. 호출 단위 제한은 모델의 timeout 등으로 따로 설정합니다.
+        max_repeated_calls: 같은 도구를 같은 인자로 호출할 수 있는 최대 횟수
+        max_handoff_repeats: 같은 방향의 핸드오프(A → B)가 허용되는 최대 횟수
+    """
+
+    def __init__(
+        self,
+        max_steps: int = 40,
+        max_llm_calls: int = 12,
+        max_tokens: int = 60_000,
+        max_seconds: float = 60.0,
+        max_repeated_calls: int = 2,
+        max_handoff_repeats: int = 2,
+    ):
+        self.max_steps = max_steps
+        self.max_llm_calls = max_llm_calls
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self.max_repeated_calls = max_repeated_calls
+        self.max_handoff_repeats = max_handoff_repeats
+
+
+class _BudgetTracker:
+    def __init__(self, budget: StepBudget):
+        self.budget = budget
+        self.started = time.monotonic()
+        self.steps = 0
+        self.llm_calls = 0
+        self.tokens = 0
+        self.tool_calls = Counter()
+        self.handoffs = Counter()
+        self.seen_ids = set()
+        self.last_answer = None
+        self.tool_outputs = []
+
+    def observe(self, state: dict, root: bool) -> str | None:
+        """새 상태를 반영하고, 예산을 넘었으면 중단 사유를 반환합니다.
+
+        root가 True인 이벤트(최상위 그래프의 values)만 superstep으로 셉니다.
+        """
+        if root:
+            self.steps += 1
+        for message in state.get("messages", []):
+            if message.id in self.seen_ids:
+                continue
+            if isinstance(message, ToolMessage):
+                self.seen_ids.add(message.id)
+                self.tool_outputs.append(message)
+                continue
+            if not isinstance(message, AIMessage):
+                continue
+            self.seen_ids.add(message.id)
+            self.llm_calls += 1
+            if message.usage_metadata:
+                self.tokens += message.usage_metadata.get("total_tokens", 0)
+            if message.content and not message.tool_calls:
+                self.last_answer = message
+            for call in message.tool_calls:
+                if call["name"].startswith("transfer_to_"):
+                    self.handoffs[(message.name, call["name"])] += 1
+                else:
+                    args = json.dumps(call["args"], sort_keys=True, ensure_ascii=False, default=str)
+                    self.tool_calls[(call["name"], args)] += 1
+
+        budget = self.budget
+        if self.steps > budget.max_steps:
+            return "superstep 예산 초과"
+        if self.llm_calls > budget.max_llm_calls:
+            return "LLM 호출 예산 초과"
+        if self.tokens > budget.max_tokens:
+            return "토큰 예산 초과"
+        if time.monotonic() - self.started > budget.max_seconds:
+            return "실행 시간 예산 초과"
+        if self.tool_calls and max(self.tool_calls.values()) > budget.max_repeated_calls:
+            return "동일한 도구 호출 반복"
+        if self.handoffs and max(self.handoffs.values()) > budget.max_handoff_repeats:
+            return "핸드오프 순환 감지"
+        return None
+
+    def usage(self) -> dict:
+        return {
+            "steps": self.steps,
+            "llm_calls": self.llm_calls,
+            "tokens": self.tokens,
+            "seconds": round(time.monotonic() - self.started, 3),
+        }
+
+
+def _close_tool_calls(messages: list, reason: str) -> list:
+    """응답이 없는 마지막 tool_calls에 ToolMessage를 채워 다음 턴이 깨지지 않게 합니다."""
+    if not messages or not isinstance(messages[-1], AIMessage):
+        return []
+    return [
+        ToolMessage(content=f"실행 중단: {reason}", tool_call_id=call["id"], name=call["name"])
+        for call in messages[-1].tool_calls
+    ]
+
+
+def _best_effort_answer(tracker: _BudgetTracker, messages: list, model) -> str:
+    """중단 시점까지의 결과로 최종 답변을 만듭니다.
+
+    model이 있으면 도구 없이 한 번 더 호출해 답변을 요약하고,
+    없으면 마지막 답변 또는 최근 도구 결과를 돌려줍니다.
+    """
+    if model is not None:
+        # 중단 원인이 timeout / rate limit일 수 있으므로 실패하면 아래 방법으로 답변을 만듦
+        try:
+            response = model.invoke([*messages, HumanMessage(content=FINAL_ANSWER_PROMPT)])
+        except Exception:
+            response = None
+        if response is not None and response.content:
+            return response.content
+    if tracker.last_answer is not None:
+        return tracker.last_answer.content
+    if tracker.tool_outputs:
+        # 같은 결과가 반복된 루프일 수 있으므로 중복을 제거하고 최근 결과만 사용
+        unique = list(dict.fromkeys(f"- {m.name or '도구'}: {m.content}" for m in tracker.tool_outputs))
+        outputs = "\n".join(unique[-MAX_TOOL_OUTPUTS:])
+        return f"실행 예산을 초과하여 작업을 중단했습니다. 지금까지 확인된 결과입니다:\n{outputs}"
+    return FALLBACK_ANSWER
+
+
+def governed_invoke(
+    app, input: dict, config: dict | None = None, budget: StepBudget | None = None, model=None
+) -> dict:
+    """예산 안에서 그래프를 실행합니다.
+
+    예산 초과, 반복 호출, 핸드오프 순환, recursion limit 도달 시 예외 대신
+    최선의 답변을 담은 최종 상태를 반환합니다. model(도구를 호출하지 않는 채팅 모델,
+    예: bind_tools(tools, tool_choice="none"))을 넘기면 지금까지의 메시지로 한 번 더 호출해 답변을 만듭니다.
+    반환 상태의 "budget" 키에 사용량과 중단 사유가 들어 있습니다.
+    """
+    budget = budget or StepBudget()
+    config = dict(config or {})
+    config.setdefault("recursion_limit", budget.max_steps + 1)
+    tracker = _BudgetTracker(budget)
+    threaded = getattr(app, "checkpointer", None) is not None and config.get("configurable", {}).get("thread_id") is not None
+    if threaded:
+        # 이전 턴의 메시지는 이번 요청의 예산에서 제외
+        tracker.seen_ids.update(m.id for m in app.get_state(config).values.get("messages", []))
+
+    final_state = dict(input)
+    latest_state = final_state  # 서브그래프 포함 가장 최근 상태 (도구 결과가 아직 상위로 올라오지 않았을 수 있음)
+    reason = None
+    try:
+        for namespace, state in app.stream(input, config=config, stream_mode="values", subgraphs=True):
+            if not namespace:
+                final_state = state
+            latest_state = state
+            reason = tracker.observe(state, root=not namespace)
+            if reason:
+                break
+    except GraphRecursionError:
+        reason = "recursion limit 도달"
+
+    if reason is None:
+        return {**final_state, "budget": {**tracker.usage(), "stopped": None}}
+
+    messages = list(final_state.get("messages", []))
+    latest = list(latest_state.get("messages", []))
+    content = _best_effort_answer(tracker, latest + _close_tool_calls(latest, reason), model)
+    patch = _close_tool_calls(messages, reason) + [AIMessage(content=content, name="budget_governor")]
+
+    # 체크포인터가 있으면 중단된 스레드에도 최종 답변을 기록해 다음 턴을 이어갈 수 있게 함
+    # 서브그래프 안에서 멈추면 최상위 체크포인트에 실행 대기 노드(next)가 남으므로
+    # END로 비워 invoke(None, config)가 중단된 루프를 다시 이어가지 않게 함
+    if threaded:
+        app.update_state(config, {"messages": patch})
+        app.update_state(config, None, as_node=END)
+
+    return {
+        **final_state,
+        "messages": messages + patch,
+        "budget": {**tracker.usage(), "stopped": reason},
+    }
@@ -0,0 +1,204 @@
+import copy
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+import uuid
+import weakref
+from collections import OrderedDict
+
+from langchain_core.messages import convert_to_messages
+
+
+# 그래프 전체 결과 캐시
+# 같은 질문이 반복되면 supervisor → 전문가 → supervisor 과정을 다시 돌리지 않고
+# 이전에 계산된 최종 상태를 그대로 돌려줍니다.
+# 캐시 키 = 정규화된 입력 + 스레드 상태 + 도구 데이터 소스 버전
+
+
+def normalize_text(text: str) -> str:
+    """질문 문자열을 정규화합니다 (유니코드, 대소문자, 공백, 끝 문장부호)."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.rstrip("?!. ")
+
+
+def _message_key(message) -> list:
+    content = message.content
+    if isinstance(content, str):
+        content = normalize_text(content)
+    else:
+        content = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    key = [message.type, getattr(message, "name", None), content]
+    # 도구 호출 메시지는 content가 비어 있으므로 호출한 도구와 인자까지 포함
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        key.append([[call["name"], call["args"]] for call in tool_calls])
+    if getattr(message, "tool_call_id", None):
+        key.append(message.tool_call_id)
+    return key
+
+
+class GraphResultCache:
+    """컴파일된 그래프의 invoke 결과를 저장하는 LRU 캐시입니다.
+
+    Args:
+        maxsize: 저장할 최대 결과 수
+        ttl: 결과 유효 시간(초), None이면 만료되지 않음
+        state_keys: 캐시 키에 포함할 스레드 상태 키 (체크포인터가 있는 그래프용)
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float | None = None, state_keys=("messages",)):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.state_keys = tuple(state_keys)
+        self._entries = OrderedDict()
+        self._source_versions = {}
+        self._graph_tokens = weakref.WeakKeyDictionary()  # 그래프 객체 -> 고유 토큰
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ------------------------------------
+    # 데이터 소스 버전 관리 (무효화)
+    # ------------------------------------
+
+    def set_source_version(self, source: str, version) -> None:
+        """도구 데이터 소스(예: web_search 스냅샷)의 버전을 지정합니다.
+
+        버전이 바뀌면 이전 버전으로 계산된 결과는 모두 삭제됩니다.
+        """
+        with self._lock:
+            if self._source_versions.get(source) == version:
+                return
+            self._source_versions[source] = version
+            self._drop_source(source)
+
+    def invalidate(self, source: str | None = None) -> None:
+        """소스 하나 또는 전체 캐시를 무효화합니다."""
+        with self._lock:
+            if source is None:
+                self._entries.clear()
+                return
+            self._source_versions[source] = time.time_ns()
+            self._drop_source(source)
+
+    def _drop_source(self, source: str) -> None:
+        version = self._source_versions.get(source)
+        stale = [
+            key for key, entry in self._entries.items()
+            if entry["sources"].get(source) != version
+        ]
+        for key in stale:
+            del self._entries[key]
+
+    # ------------------------------------
+    # 키 생성
+    # ------------------------------------
+
+    def _thread_state(self, app, config) -> dict:
+        thread_id = (config or {}).get("configurable", {}).get("thread_id")
+        if thread_id is None or getattr(app, "checkpointer", None) is None:
+            return {}
+        values = app.get_state(config).values
+        state = {}
+        for key in self.state_keys:
+            if key not in values:
+                continue
+            value = values[key]
+            if key == "messages":
+                state[key] = [_message_key(m) for m in value]
+            else:
+                state[key] = value
+        return state
+
+    def _graph_key(self, app, namespace: str | None) -> str:
+        # 컴파일된 그래프의 name은 기본값이 모두 "LangGraph"이므로 그래프 객체별 토큰을 사용
+        # (id(app)는 그래프가 사라진 뒤 재사용될 수 있어 쓰지 않음)
+        if namespace is not None:
+            return f"ns:{namespace}"
+        with self._lock:
+            if app not in self._graph_tokens:
+                self._graph_tokens[app] = uuid.uuid4().hex
+            return self._graph_tokens[app]
+
+    def fingerprint(self, app, input: dict, config: dict | None = None, namespace: str | None = None) -> str:
+        """정규화된 입력과 스레드 상태로 캐시 키를 만듭니다.
+
+        namespace를 지정하면 그래프 객체 대신 이름으로 결과를 구분합니다
+        (예: 같은 그래프를 다시 컴파일해도 캐시를 공유하려는 경우).
+        """
+        normalized = {}
+        for key, value in input.items():
+            if key == "messages":
+                # add_messages와 같이 list가 아닌 입력(문자열 하나 등)은 메시지 하나로 취급
+                if not isinstance(value, list):
+                    value = [value]
+                normalized[key] = [_message_key(m) for m in convert_to_messages(value)]
+            else:
+                normalized[key] = value
+        payload = {
+            "graph": self._graph_key(app, namespace),
+            "input": normalized,
+            "thread": self._thread_state(app, config),
+            "sources": sorted(self._source_versions.items()),
+        }
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ------------------------------------
+    # 조회 / 저장
+    # ------------------------------------
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry["time"] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["result"]
+
+    def put(self, key: str, result: dict) -> None:
+        with self._lock:
+            sources = dict(self._source_versions)
+            self._entries[key] = {"result": result, "sources": sources, "time": time.monotonic()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invoke(self, app, input: dict, config: dict | None = None, namespace: str | None = None, **kwargs) -> dict:
+        """캐시를 거쳐 그래프를 실행합니다. 적중하면 그래프를 실행하지 않습니다.
+
+        체크포인터가 있는 스레드에서 캐시가 적중하면 스레드 기록은 갱신되지 않으므로,
+        주로 상태가 없는 진입점(FAQ 형태의 질문)에 사용합니다.
+        """
+        key = self.fingerprint(app, input, config, namespace)
+        cached = self.get(key)
+        if cached is not None:
+            # 호출자가 결과(메시지 객체 포함)를 수정해도 캐시가 오염되지 않도록 복사본을 반환
+            return copy.deepcopy(cached)
+        result = app.invoke(input, config=config, **kwargs)
+        self.put(key, copy.deepcopy(result))
+        return result
+
+    def stats(self) -> dict:
+        """캐시 적중률 통계를 반환합니다."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+                "evictions": self.evictions,
+                "sources": dict(self._source_versions),
+            }
@@ -0,0 +1,79 @@
+import os
+import threading
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# 공유 HTTP 커넥션 풀
+# ChatOpenAI / OpenAIEmbeddings / WebBaseLoader가 각자 클라이언트를 만들면
+# 요청마다 TCP/TLS 연결을 새로 맺게 됩니다. 프로세스 전체에서 keep-alive 연결을
+# 재사용하도록 클라이언트를 하나씩만 만들어 공유합니다.
+# (OpenAI SDK는 httpx, WebBaseLoader는 requests를 사용하므로 종류별로 하나씩)
+
+MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", "60"))
+TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+_lock = threading.Lock()
+_clients = {}
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """프로세스에서 공유하는 동기 httpx 클라이언트를 반환합니다."""
+    with _lock:
+        if "sync" not in _clients:
+            _clients["sync"] = httpx.Client(limits=_limits(), timeout=TIMEOUT)
+        return _clients["sync"]
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """프로세스에서 공유하는 비동기 httpx 클라이언트를 반환합니다."""
+    with _lock:
+        if "async" not in _clients:
+            _clients["async"] = httpx.AsyncClient(limits=_limits(), timeout=TIMEOUT)
+        return _clients["async"]
+
+
+def get_requests_session() -> requests.Session:
+    """WebBaseLoader 등 requests 기반 로더가 공유하는 세션을 반환합니다."""
+    with _lock:
+        if "requests" not in _clients:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=MAX_KEEPALIVE, pool_maxsize=MAX_CONNECTIONS)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _clients["requests"] = session
+        return _clients["requests"]
+
+
+def pooled_clients() -> dict:
+    """ChatOpenAI / OpenAIEmbeddings 생성자에 넘길 공유 클라이언트 인자입니다.
+
+    사용 예:
+        model = ChatOpenAI(model="gpt-4o-mini", **pooled_clients())
+    """
+    return {"http_client": get_http_client(), "http_async_client": get_async_http_client()}
+
+
+async def aclose() -> None:
+    """서버 종료 시 공유 클라이언트를 닫습니다."""
+    with _lock:
+        clients = dict(_clients)
+        _clients.clear()
+    if "async" in clients:
+        await clients["async"].aclose()
+    if "sync" in clients:
+        clients["sync"].close()
+    if "requests" in clients:
+        clients["requests"].close()
@@ -0,0 +1,190 @@
+import math
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict, PrivateAttr
+
+
+# BM25 + FAISS 하이브리드 검색기
+# 키워드 위주의 질문("부동산 대출 규제")은 로컬 BM25 색인만으로 답하고
+# 임베딩 API를 호출하지 않습니다. 키워드로 충분하지 않을 때만 쿼리를 임베딩해서
+# FAISS 결과와 BM25 결과를 RRF(Reciprocal Rank Fusion)로 합칩니다.
+
+_token_pattern = re.compile(r"[0-9A-Za-z]+|[가-힣]+")
+
+
+def tokenize(text: str) -> list:
+    """영문/숫자는 단어 단위, 한글은 조사가 붙어도 맞도록 2글자(bigram) 단위로 나눕니다."""
+    tokens = []
+    for word in _token_pattern.findall(text.lower()):
+        if word[0] < "가" or len(word) < 2:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class LRUCache:
+    """OrderedDict 기반의 간단한 LRU 캐시입니다."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class BM25Index:
+    """문서 조각에 대한 BM25 역색인입니다."""
+
+    def __init__(self, documents: list, k1: float = 1.5, b: float = 0.75):
+        self.documents = documents
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(list)  # token -> [(문서 번호, 빈도)]
+        self.lengths = []
+        for doc_id, document in enumerate(documents):
+            counts = Counter(tokenize(document.page_content))
+            self.lengths.append(sum(counts.values()))
+            for token, freq in counts.items():
+                self.postings[token].append((doc_id, freq))
+        self.avg_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+
+    def idf(self, token: str) -> float:
+        df = len(self.postings.get(token, ()))
+        return math.log(1 + (len(self.documents) - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int) -> list:
+        """(문서 번호, 점수, 일치한 쿼리 토큰 수) 목록을 점수 순으로 반환합니다."""
+        scores = defaultdict(float)
+        matched = defaultdict(int)
+        for token in set(tokenize(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = self.idf(token)
+            for doc_id, freq in postings:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / self.avg_length)
+                scores[doc_id] += idf * freq * (self.k1 + 1) / (freq + norm)
+                matched[doc_id] += 1
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(doc_id, score, matched[doc_id]) for doc_id, score in ranked]
+
+
+class HybridRetriever(BaseRetriever):
+    """BM25 역색인과 FAISS를 함께 사용하는 검색기입니다.
+
+    키워드 결과가 k개보다 적으면 임베딩 검색을 함께 사용하므로 (문서가 충분하면) 항상 k개를 반환합니다.
+
+    Args:
+        vectorstore: 문서가 저장된 FAISS 벡터 DB
+        embeddings: 쿼리 임베딩에 사용할 모델
+        documents: BM25 색인을 만들 문서 조각 (vectorstore와 같은 문서)
+        k: 반환할 문서 수
+        keyword_coverage: 상위 BM25 결과가 쿼리 토큰을 이 비율 이상 포함하면 임베딩 없이 반환
+        rrf_k: RRF 순위 보정 상수
+        cache_size: 쿼리 임베딩/검색 결과 LRU 캐시 크기
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    vectorstore: FAISS
+    embeddings: Embeddings
+    documents: list[Document]
+    k: int = 4
+    keyword_coverage: float = 0.7
+    rrf_k: int = 60
+    cache_size: int = 256
+
+    _index: BM25Index = PrivateAttr()
+    _embedding_cache: LRUCache = PrivateAttr()
+    _result_cache: LRUCache = PrivateAttr()
+    _stats: Counter = PrivateAttr(default_factory=Counter)
+
+    def model_post_init(self, __context) -> None:
+        self._index = BM25Index(self.documents)
+        self._embedding_cache = LRUCache(self.cache_size)
+        self._result_cache = LRUCache(self.cache_size)
+
+    @classmethod
+    def from_documents(cls, documents: list, embeddings: Embeddings, **kwargs) -> "HybridRetriever":
+        """문서로 FAISS 벡터 DB와 BM25 색인을 함께 만듭니다."""
+        vectorstore = FAISS.from_documents(documents, embeddings)
+        return cls(vectorstore=vectorstore, embeddings=embeddings, documents=documents, **kwargs)
+
+    def _embed(self, query: str) -> list:
+        embedding = self._embedding_cache.get(query)
+        if embedding is None:
+            self._stats["embedding_calls"] += 1
+            embedding = self.embeddings.embed_query(query)
+            self._embedding_cache.put(query, embedding)
+        return embedding
+
+    def _search(self, query: str) -> list:
+        fetch_k = self.k * 3
+        keyword_hits = self._index.search(query, fetch_k)
+        query_tokens = len(set(tokenize(query)))
+
+        # 상위 키워드 결과가 k개 채워지고 쿼리 토큰을 충분히 포함하면 로컬 색인만으로 응답
+        top = keyword_hits[:self.k]
+        enough = len(top) >= min(self.k, len(self.documents))
+        if top and enough and max(m for _, _, m in top) / query_tokens >= self.keyword_coverage:
+            self._stats["keyword_only"] += 1
+            return [self.documents[doc_id] for doc_id, _, _ in top]
+
+        self._stats["hybrid"] += 1
+        dense_hits = self.vectorstore.similarity_search_with_score_by_vector(self._embed(query), k=fetch_k)
+
+        # 문서 내용 기준으로 두 순위를 RRF로 합침
+        fused = defaultdict(float)
+        by_content = {}
+        for rank, (doc_id, _, _) in enumerate(keyword_hits):
+            document = self.documents[doc_id]
+            by_content[document.page_content] = document
+            fused[document.page_content] += 1 / (self.rrf_k + rank + 1)
+        for rank, (document, _) in enumerate(dense_hits):
+            by_content.setdefault(document.page_content, document)
+            fused[document.page_content] += 1 / (self.rrf_k + rank + 1)
+        ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:self.k]
+        return [by_content[content] for content, _ in ranked]
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list:
+        # 정규화는 캐시 키에만 사용하고, 검색/임베딩에는 원래 질문을 그대로 사용
+        key = " ".join(query.split()).lower()
+        documents = self._result_cache.get(key)
+        if documents is None:
+            documents = self._search(query)
+            self._result_cache.put(key, documents)
+        else:
+            self._stats["result_cache_hits"] += 1
+        return list(documents)
+
+    def stats(self) -> dict:
+        """검색 경로별 호출 수와 캐시 크기를 반환합니다."""
+        return {
+            **self._stats,
+            "embedding_cache_size": len(self._embedding_cache),
+            "result_cache_size": len(self._result_cache),
+        }
@@ -20,6 +20,9 @@ from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain_community.document_loaders import WebBaseLoader
 
+# BM25 역색인 + FAISS 하이브리드 검색기 (키워드 질문은 임베딩 API 호출 없이 처리)
+from hybrid_retriever import HybridRetriever
+
 # agent tools 중 wikipedia 사용
 from langchain_community.utilities import WikipediaAPIWrapper
 from langchain_community.tools import WikipediaQueryRun
@@ -27,12 +30,15 @@ from langchain_community.tools import WikipediaQueryRun
 #openAI LLM 설정
 from langchain_openai import ChatOpenAI
 import os
+
+# 모델, 임베딩, 웹 로더가 keep-alive 연결을 공유하도록 공용 HTTP 클라이언트 사용
+from http_pool import get_requests_session, pooled_clients
 from dotenv import load_dotenv
 load_dotenv()
 
 # 일관된 값을 위하여 Temperature 0.1로 설정 model은 gpt-4o로도 설정 할 수 있습니다.
 openai = ChatOpenAI(
-    model="gpt-4o-mini", api_key=os.getenv("OPENAI_API_KEY"), temperature=0.1)
+    model="gpt-4o-mini", api_key=os.getenv("OPENAI_API_KEY"), temperature=0.1, **pooled_clients())
 
 
 # agent 시물레이션을 위한 prompt 참조
@@ -49,19 +55,18 @@ print(wiki.name)
 
 
 # 네이버 기사 내용을 가져와서 벡터 DB 생성
-loader = WebBaseLoader("https://news.naver.com/") # 네이버 뉴스 웹 페이지 로드
+loader = WebBaseLoader("https://news.naver.com/", session=get_requests_session()) # 네이버 뉴스 웹 페이지 로드
 docs = loader.load() # 웹 문서 로드
 
 # 문서를 1000자의 덩어리로 나누되, 각 덩어리의 200자 정도는 중첩되도록 설정
 documents = RecursiveCharacterTextSplitter(
     chunk_size=1000, chunk_overlap=200).split_documents(docs)
 
-# 문서를 임베딩하고 FAISS 벡터 DB로 저장
-vectordb = FAISS.from_documents(documents, OpenAIEmbeddings())
-retriever = vectordb.as_retriever() # 벡터 DB를 검색기로 변환
+# 문서를 임베딩하고 FAISS 벡터 DB로 저장하면서 같은 문서로 BM25 색인도 생성
+retriever = HybridRetriever.from_documents(documents, OpenAIEmbeddings(**pooled_clients()))
 
 #검색기 객체 출력 확인
-print(retriever)
+print(f"HybridRetriever: 문서 {len(documents)}개, k={retriever.k}")
 
 
 # 검색 도구 생성
@@ -95,3 +100,6 @@ agent_result = agent_executor.invoke({"input": "오늘 부동산 관련 주요 
 
 #결과 출력
 print(agent_result)
+
+# 검색 경로별 통계 (keyword_only: 로컬 색인만 사용, hybrid: 임베딩 + FAISS 사용)
+print(retriever.stats())
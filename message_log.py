@@ -0,0 +1,282 @@
+import threading
+import uuid
+from collections.abc import Sequence
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import RemoveMessage, convert_to_messages
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+
+# 추가(append)에 최적화된 메시지 채널 (선택 사용)
+# 기본 add_messages 리듀서는 superstep마다 전체 메시지 목록을 복사하고 id로 중복을 검사하므로
+# 대화가 길어질수록 단계당 비용이 O(n)으로 늘어납니다.
+# MessageLog는 여러 버전이 하나의 append 전용 저장소를 공유하는 불변 view이므로
+# 추가, id 조회, 채널 복사가 대화 길이와 무관하게 O(1)입니다.
+# (메시지 교체/삭제처럼 드문 경우에만 O(n)으로 새 저장소를 만듭니다.)
+#
+# 체크포인터가 없는 그래프(한 번의 invoke 안에서 agent ↔ tools 루프가 길게 도는 경우 등)에 사용합니다.
+# 체크포인터는 매 단계 전체 메시지 목록을 직렬화해 저장하므로 체크포인터가 있으면 단계당 비용은
+# MessagesState와 마찬가지로 O(n)이고 이득이 없습니다 (python message_log.py로 확인).
+#
+# 주의: create_react_agent / create_swarm / create_supervisor 내부 에이전트는 add_messages(list)를
+# 전제로 하므로 StateGraph로 직접 만든 그래프에 사용합니다.
+
+
+class _Store:
+    __slots__ = ("items", "index", "lock")
+
+    def __init__(self):
+        self.items = []  # append 전용, 앞부분은 절대 수정하지 않음
+        self.index = {}  # 메시지 id -> 저장소 위치
+        self.lock = threading.Lock()
+
+
+class MessageLog(Sequence):
+    """append 전용 저장소 위의 불변 메시지 목록 view입니다.
+
+    list처럼 인덱싱/슬라이싱/순회할 수 있고, 새 메시지를 추가하면 기존 view는 그대로 둔 채
+    저장소를 공유하는 새 view를 돌려줍니다.
+    """
+
+    __slots__ = ("_store", "_length")
+
+    def __init__(self, messages=()):
+        self._store = _Store()
+        self._length = 0
+        for message in messages:
+            self._store.index[message.id] = len(self._store.items)
+            self._store.items.append(message)
+        self._length = len(self._store.items)
+
+    @classmethod
+    def _view(cls, store: _Store, length: int) -> "MessageLog":
+        log = cls.__new__(cls)
+        log._store = store
+        log._length = length
+        return log
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self._store.items[:self._length][i]
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError("MessageLog index out of range")
+        return self._store.items[i]
+
+    def __iter__(self):
+        items = self._store.items
+        for i in range(self._length):
+            yield items[i]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"MessageLog({list(self)!r})"
+
+    def __copy__(self) -> "MessageLog":
+        return self  # 불변이므로 복사할 필요 없음
+
+    def __deepcopy__(self, memo) -> "MessageLog":
+        return self
+
+    def _asdict(self) -> dict:
+        # 체크포인트 직렬화 시 MessageLog(messages=[...])로 복원됨
+        return {"messages": list(self)}
+
+    def get(self, message_id: str):
+        """id로 메시지를 찾습니다. 없으면 None을 반환합니다."""
+        position = self._store.index.get(message_id)
+        if position is None or position >= self._length:
+            return None
+        return self._store.items[position]
+
+    def appended(self, messages: list) -> "MessageLog":
+        """메시지를 추가한 새 view를 반환합니다. 최신 view에 추가하면 O(추가 개수)입니다."""
+        if not messages:
+            return self
+        store = self._store
+        with store.lock:
+            # 조건부 엣지 등은 채널 복사본에 같은 쓰기를 미리 적용해 보므로(local read),
+            # 저장소 뒤쪽이 추가하려는 메시지와 같다면 그 부분을 그대로 재사용
+            tail = store.items[self._length:self._length + len(messages)]
+            if len(tail) == len(messages) and all(a is b for a, b in zip(tail, messages)):
+                return self._view(store, self._length + len(messages))
+            if len(store.items) == self._length:
+                for message in messages:
+                    store.index[message.id] = len(store.items)
+                    store.items.append(message)
+                return self._view(store, len(store.items))
+        # 과거 view에서 갈라지는 경우(time travel 등)에는 새 저장소를 만듦
+        return MessageLog([*self, *messages])
+
+
+def append_messages(left, right) -> MessageLog:
+    """add_messages와 같은 규칙(id 기준 추가/교체/삭제)을 따르는 MessageLog 리듀서입니다.
+
+    이미 있는 id와 같은 내용의 메시지는 건너뛰므로, 서브그래프가 전체 기록을 돌려줘도
+    새로 생긴 메시지만 추가됩니다.
+    """
+    if left is None:
+        left = MessageLog()
+    elif isinstance(left, list):
+        # 체크포인트에서 list로 복원된 경우 한 번만 변환
+        left = MessageLog(convert_to_messages(left))
+    elif not isinstance(left, MessageLog):
+        # 허용되지 않은 타입으로 역직렬화되면 dict 등이 들어오므로 기록을 버리지 않고 실패시킴
+        raise TypeError(
+            f"append_messages expected a list or MessageLog, got {type(left).__name__}. "
+            'Use JsonPlusSerializer(allowed_msgpack_modules=[("message_log", "MessageLog")]) for the checkpointer.'
+        )
+    if not isinstance(right, (list, tuple, MessageLog)):
+        right = [right]
+    right = convert_to_messages(right)
+    for message in right:
+        if message.id is None:
+            message.id = str(uuid.uuid4())
+
+    remove_all = [i for i, m in enumerate(right) if isinstance(m, RemoveMessage) and m.id == REMOVE_ALL_MESSAGES]
+    if remove_all:
+        return append_messages(MessageLog(), right[remove_all[-1] + 1:])
+
+    new, pending, replaced, removed = [], {}, {}, set()
+    for message in right:
+        existing = left.get(message.id)
+        if isinstance(message, RemoveMessage):
+            if existing is None and message.id not in pending:
+                raise ValueError(f"Attempting to delete a message with an ID that doesn't exist ('{message.id}')")
+            removed.add(message.id)
+        elif existing is not None:
+            if existing is not message and existing != message:
+                replaced[message.id] = message
+        elif message.id in pending:
+            new[pending[message.id]] = message
+        else:
+            pending[message.id] = len(new)
+            new.append(message)
+
+    if not replaced and not removed:
+        return left.appended(new)
+
+    merged = [replaced.get(m.id, m) for m in [*left, *new]]
+    return MessageLog([m for m in merged if m.id not in removed])
+
+
+class AppendMessagesState(TypedDict):
+    """MessagesState 대신 사용할 수 있는 append 최적화 상태입니다."""
+
+    messages: Annotated[MessageLog, append_messages]
+
+
+# ====================================
+# 벤치마크: python message_log.py
+# ====================================
+
+if __name__ == "__main__":
+    import time
+
+    from langchain_core.messages import AIMessage, HumanMessage
+    from langgraph.checkpoint.memory import InMemorySaver
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from langgraph.graph import END, MessagesState, StateGraph
+    from langgraph.graph.message import add_messages
+
+    # __main__으로 실행하면 클래스 경로가 __main__.MessageLog가 되므로 직렬화 허용 목록과 맞게 모듈로 불러옴
+    import message_log
+
+    serde = JsonPlusSerializer(allowed_msgpack_modules=[("message_log", "MessageLog")])
+
+    def bench(reducer, empty, history: int, steps: int = 200) -> tuple:
+        """history개 메시지가 쌓인 상태에서 리듀서 병합 / id 조회 / 체크포인트 직렬화+복원 비용(µs)을 잽니다."""
+        messages = empty
+        for i in range(history):
+            messages = reducer(messages, [HumanMessage(content=f"질문 {i}", id=f"m{i}")])
+
+        rounds = 10
+        start = time.perf_counter()
+        for _ in range(rounds):
+            serde.loads_typed(serde.dumps_typed(messages))
+        checkpoint = (time.perf_counter() - start) / rounds * 1e6
+
+        start = time.perf_counter()
+        for i in range(steps):
+            if isinstance(messages, message_log.MessageLog):
+                messages.get(f"m{history - 1 - i % history}")
+            else:
+                next(m for m in messages if m.id == f"m{history - 1 - i % history}")
+        lookup = (time.perf_counter() - start) / steps * 1e6
+
+        start = time.perf_counter()
+        for i in range(steps):
+            messages = reducer(messages, [AIMessage(content=f"답변 {i}", id=f"s{i}")])
+        merge = (time.perf_counter() - start) / steps * 1e6
+        return merge, lookup, checkpoint
+
+    def bench_graph(state_schema, history: int, checkpointer=None, steps: int = 20) -> float:
+        """history개 메시지가 쌓인 뒤 superstep 1회당 비용(ms)을 잽니다.
+
+        체크포인터가 없으면 한 번의 invoke 안에서 루프를 돌고 (steps × 10단계),
+        있으면 같은 스레드에 steps번 invoke합니다.
+        """
+        def reply(state):
+            return {"messages": [AIMessage(content="답변")]}
+
+        limit = {"steps": steps}
+
+        def route(state):
+            return "agent" if len(state["messages"]) < history + limit["steps"] else END
+
+        workflow = StateGraph(state_schema)
+        workflow.add_node("agent", reply)
+        workflow.set_entry_point("agent")
+        history_messages = [HumanMessage(content=f"질문 {i}") for i in range(history)]
+
+        if checkpointer is None:
+            workflow.add_conditional_edges("agent", route)
+            app = workflow.compile()
+
+            def run(n: int) -> float:
+                limit["steps"] = n
+                timings = []
+                for _ in range(3):
+                    start = time.perf_counter()
+                    app.invoke({"messages": history_messages}, {"recursion_limit": n + 1})
+                    timings.append(time.perf_counter() - start)
+                return min(timings)
+
+            # 입력 변환 등 invoke 1회의 고정 비용을 빼기 위해 1단계 실행과의 차이로 계산
+            loop_steps = steps * 10
+            return (run(loop_steps + 1) - run(1)) / loop_steps * 1e3
+
+        workflow.add_edge("agent", END)
+        app = workflow.compile(checkpointer=checkpointer)
+        config = {"configurable": {"thread_id": "bench"}}
+        app.update_state(config, {"messages": history_messages})
+        start = time.perf_counter()
+        for i in range(steps):
+            app.invoke({"messages": [HumanMessage(content=f"추가 질문 {i}")]}, config)
+        return (time.perf_counter() - start) / steps * 1e3
+
+    print(f"{'history':>8} | {'add_messages (merge/lookup/serde µs)':>39} | {'append_messages (merge/lookup/serde µs)':>41}")
+    for history in (10, 100, 1000, 5000):
+        base = bench(add_messages, [], history)
+        fast = bench(message_log.append_messages, message_log.MessageLog(), history)
+        print(
+            f"{history:>8} | {base[0]:>12.1f} {base[1]:>12.1f} {base[2]:>13.1f} | "
+            f"{fast[0]:>13.1f} {fast[1]:>13.1f} {fast[2]:>13.1f}"
+        )
+
+    print()
+    print(f"{'history':>8} | {'MessagesState (step ms: 없음/체크포인터)':>36} | {'AppendMessagesState (step ms: 없음/체크포인터)':>42}")
+    for history in (10, 1000, 5000):
+        row = []
+        for state_schema in (MessagesState, message_log.AppendMessagesState):
+            row.append(bench_graph(state_schema, history))
+            row.append(bench_graph(state_schema, history, InMemorySaver(serde=serde)))
+        print(f"{history:>8} | {row[0]:>17.2f} {row[1]:>18.2f} | {row[2]:>20.2f} {row[3]:>21.2f}")
@@ -0,0 +1,138 @@
+import base64
+import hashlib
+import json
+import struct
+import time
+
+import uvicorn
+
+
+# 테스트용 로컬 mock upstream (OpenAI 호환 API + 뉴스 페이지)
+# 실제 API 키 없이 server.py를 띄워 커넥션 재사용을 확인할 때 사용합니다.
+#
+#   python mock_upstream.py
+#   OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=mock python server.py
+#   curl http://127.0.0.1:8001/stats   # connections가 requests보다 훨씬 작으면 keep-alive 재사용 중
+#
+# WebBaseLoader 테스트: WebBaseLoader("http://127.0.0.1:8001/news", session=get_requests_session())
+
+EMBEDDING_DIM = 64
+
+NEWS_PAGE = """<html><body>
+<h1>오늘의 주요 뉴스</h1>
+<p>정부가 부동산 대출 규제를 완화한다고 발표했습니다.</p>
+<p>코스피가 외국인 매수세에 힘입어 상승 마감했습니다.</p>
+</body></html>"""
+
+_stats = {"requests": 0, "connections": set()}
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+async def _send(send, status: int, body: bytes, content_type: str) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _last_user_text(messages: list) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            content = message.get("content")
+            return content if isinstance(content, str) else json.dumps(content, ensure_ascii=False)
+    return ""
+
+
+def _embedding(value) -> list:
+    digest = hashlib.sha256(json.dumps(value).encode("utf-8")).digest()
+    return [(digest[i % len(digest)] - 128) / 128 for i in range(EMBEDDING_DIM)]
+
+
+async def _chat_completions(body: dict, send) -> None:
+    text = f"mock 응답: {_last_user_text(body.get('messages', []))}"
+    created = int(time.time())
+    model = body.get("model", "mock")
+    usage = {"prompt_tokens": 10, "completion_tokens": len(text), "total_tokens": 10 + len(text)}
+
+    if not body.get("stream"):
+        response = {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": usage,
+        }
+        await _send(send, 200, json.dumps(response, ensure_ascii=False).encode("utf-8"), "application/json")
+        return
+
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/event-stream")]})
+
+    def chunk(delta: dict, finish_reason=None) -> bytes:
+        payload = {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8")
+
+    await send({"type": "http.response.body", "body": chunk({"role": "assistant", "content": ""}), "more_body": True})
+    for word in text.split(" "):
+        await send({"type": "http.response.body", "body": chunk({"content": word + " "}), "more_body": True})
+    await send({"type": "http.response.body", "body": chunk({}, "stop"), "more_body": True})
+    if (body.get("stream_options") or {}).get("include_usage"):
+        payload = {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": created,
+                   "model": model, "choices": [], "usage": usage}
+        await send({"type": "http.response.body", "body": f"data: {json.dumps(payload)}\n\n".encode(), "more_body": True})
+    await send({"type": "http.response.body", "body": b"data: [DONE]\n\n"})
+
+
+async def _embeddings(body: dict, send) -> None:
+    inputs = body.get("input", [])
+    if not isinstance(inputs, list) or (inputs and isinstance(inputs[0], int)):
+        inputs = [inputs]
+    data = []
+    for index, value in enumerate(inputs):
+        vector = _embedding(value)
+        if body.get("encoding_format") == "base64":
+            vector = base64.b64encode(struct.pack(f"<{len(vector)}f", *vector)).decode("ascii")
+        data.append({"object": "embedding", "index": index, "embedding": vector})
+    response = {"object": "list", "data": data, "model": body.get("model", "mock"),
+                "usage": {"prompt_tokens": len(inputs), "total_tokens": len(inputs)}}
+    await _send(send, 200, json.dumps(response).encode("utf-8"), "application/json")
+
+
+async def app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    _stats["requests"] += 1
+    _stats["connections"].add(tuple(scope.get("client") or ()))
+
+    path, method = scope["path"], scope["method"]
+    if method == "POST" and path == "/v1/chat/completions":
+        await _chat_completions(json.loads(await _read_body(receive) or b"{}"), send)
+    elif method == "POST" and path == "/v1/embeddings":
+        await _embeddings(json.loads(await _read_body(receive) or b"{}"), send)
+    elif method == "GET" and path == "/news":
+        await _send(send, 200, NEWS_PAGE.encode("utf-8"), "text/html; charset=utf-8")
+    elif method == "GET" and path == "/stats":
+        stats = {"requests": _stats["requests"], "connections": len(_stats["connections"])}
+        await _send(send, 200, json.dumps(stats).encode(), "application/json")
+    else:
+        await _send(send, 404, b'{"error": "not found"}', "application/json")
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=8001)
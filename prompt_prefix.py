@@ -0,0 +1,118 @@
+import hashlib
+import json
+import threading
+from collections import defaultdict
+
+import tiktoken
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+# 프롬프트 prefix 캐시 모니터
+# OpenAI 등 provider의 prompt caching은 요청 앞부분(prefix)이 바이트 단위로 같을 때만 적중합니다.
+# 요청은 항상 [도구 스키마] + [시스템 프롬프트] + [대화 기록] 순서로 조립되므로
+# 에이전트별로 prefix가 매 턴 같은지, 실제로 캐시된 토큰 비율이 얼마인지 집계합니다.
+
+_encoding = None  # gpt-4o 계열 토크나이저 (처음 사용할 때 불러옴)
+
+
+def count_tokens(text: str) -> int:
+    # tiktoken은 처음 사용할 때 BPE 파일을 내려받으므로 import 시점이 아닌 여기서 불러옴
+    global _encoding
+    if _encoding is None:
+        _encoding = tiktoken.get_encoding("o200k_base")
+    return len(_encoding.encode(text))
+
+
+def _agent_name(metadata: dict) -> str:
+    if metadata.get("lc_agent_name"):
+        return metadata["lc_agent_name"]
+    node = metadata.get("langgraph_node", "unknown")
+    # react agent의 LLM 노드는 "agent"이므로 namespace에서 에이전트 이름을 찾음
+    namespace = [part.split(":")[0] for part in metadata.get("checkpoint_ns", "").split("|") if part]
+    names = [name for name in namespace if name not in ("agent", node)]
+    if node == "agent" and names:
+        return names[-1]
+    return node
+
+
+class PrefixCacheMonitor(BaseCallbackHandler):
+    """에이전트별 cacheable prefix 길이와 실제 캐시 적중 토큰 비율을 집계합니다.
+
+    사용 예:
+        monitor = PrefixCacheMonitor()
+        app.invoke(inputs, config={"callbacks": [monitor]})
+        monitor.print_report()
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs = {}
+        self._stats = defaultdict(lambda: {
+            "calls": 0,
+            "prefix_tokens": 0,
+            "prefixes": set(),
+            "input_tokens": 0,
+            "cached_tokens": 0,
+        })
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        agent = _agent_name(metadata or {})
+        tools = (kwargs.get("invocation_params") or {}).get("tools") or []
+        # 앞쪽 연속된 시스템 메시지까지가 매 턴 같은 prefix
+        system = []
+        for message in messages[0] if messages else []:
+            if message.type != "system":
+                break
+            system.append(message.content)
+        prefix = json.dumps({"tools": tools, "system": system}, sort_keys=True, ensure_ascii=False)
+        with self._lock:
+            self._runs[run_id] = agent
+            stats = self._stats[agent]
+            stats["calls"] += 1
+            stats["prefix_tokens"] = max(stats["prefix_tokens"], count_tokens(prefix))
+            stats["prefixes"].add(hashlib.sha256(prefix.encode("utf-8")).hexdigest())
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            agent = self._runs.pop(run_id, None)
+            if agent is None:
+                return
+            for generations in response.generations:
+                for generation in generations:
+                    usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                    if not usage:
+                        continue
+                    details = usage.get("input_token_details") or {}
+                    self._stats[agent]["input_tokens"] += usage.get("input_tokens", 0)
+                    self._stats[agent]["cached_tokens"] += details.get("cache_read", 0)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            self._runs.pop(run_id, None)
+
+    def report(self) -> dict:
+        """에이전트별 prefix 길이, prefix 종류 수, 캐시 적중 비율을 반환합니다.
+
+        distinct_prefixes가 1보다 크면 해당 에이전트의 prefix가 턴마다 바뀌고 있다는 뜻입니다.
+        """
+        with self._lock:
+            report = {}
+            for agent, stats in self._stats.items():
+                input_tokens = stats["input_tokens"]
+                report[agent] = {
+                    "calls": stats["calls"],
+                    "prefix_tokens": stats["prefix_tokens"],
+                    "distinct_prefixes": len(stats["prefixes"]),
+                    "input_tokens": input_tokens,
+                    "cached_tokens": stats["cached_tokens"],
+                    "cached_ratio": stats["cached_tokens"] / input_tokens if input_tokens else 0.0,
+                }
+            return report
+
+    def print_report(self) -> None:
+        print(f"{'agent':<30}{'calls':>6}{'prefix':>8}{'kinds':>6}{'input':>9}{'cached':>9}{'ratio':>8}")
+        for agent, row in sorted(self.report().items()):
+            print(
+                f"{agent:<30}{row['calls']:>6}{row['prefix_tokens']:>8}{row['distinct_prefixes']:>6}"
+                f"{row['input_tokens']:>9}{row['cached_tokens']:>9}{row['cached_ratio']:>8.1%}"
+            )
@@ -0,0 +1,249 @@
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import uvicorn
+from langchain_core.messages import AIMessageChunk, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+import http_pool
+
+
+# 컴파일된 swarm / supervisor 그래프를 서비스하는 ASGI 서버
+#
+#   POST /graphs/{name}/invoke   {"message": "...", "session_id": "..."}  → JSON 응답
+#   POST /graphs/{name}/stream   {"message": "...", "session_id": "..."}  → NDJSON 토큰 스트림
+#   GET  /health
+#
+# session_id는 서버가 그래프별 thread_id로 매핑하므로 같은 session_id로 요청하면 대화가 이어집니다.
+# session_id 없이 보낸 요청은 1회성으로 처리하고 대화 기록을 남기지 않습니다.
+# 세션은 최대 MAX_SESSIONS개, 마지막 사용 후 SESSION_TTL초까지 유지됩니다.
+# 모든 모델/임베딩/로더 호출은 http_pool의 공용 keep-alive 클라이언트를 사용합니다.
+#
+#   uvicorn server:app --port 8000
+
+BASE_DIR = Path(__file__).resolve().parent
+
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "1000"))
+SESSION_TTL = float(os.getenv("SESSION_TTL", "3600"))
+
+logger = logging.getLogger(__name__)
+
+graphs = {}
+_sessions = OrderedDict()  # (그래프 이름, session_id) -> _Session, 오래 사용하지 않은 순
+
+
+class _Session:
+    __slots__ = ("thread_id", "lock", "last_used")
+
+    def __init__(self):
+        self.thread_id = uuid.uuid4().hex
+        self.lock = asyncio.Lock()  # 같은 스레드의 동시 실행 방지
+        self.last_used = time.monotonic()
+
+
+def _load_module(filename: str):
+    """파일 이름에 '-'가 있는 예제 스크립트를 모듈로 불러옵니다."""
+    name = Path(filename).stem.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, BASE_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_graphs() -> dict:
+    """서비스할 그래프를 불러옵니다. session → thread_id 매핑을 위해 모두 체크포인터를 사용합니다."""
+    swarm = _load_module("swarm-multiagent-finance-simple.py").app
+    supervisor = _load_module("supervisor-multiagent.py").workflow.compile(checkpointer=InMemorySaver())
+    return {"swarm": swarm, "supervisor": supervisor}
+
+
+async def _evict_sessions() -> None:
+    """만료되었거나 개수 제한을 넘은 세션과 그 체크포인트를 삭제합니다 (실행 중인 세션 제외)."""
+    now = time.monotonic()
+    for key, session in list(_sessions.items()):
+        expired = now - session.last_used > SESSION_TTL
+        if not expired and len(_sessions) <= MAX_SESSIONS:
+            break
+        if session.lock.locked():
+            continue
+        del _sessions[key]
+        await graphs[key[0]].checkpointer.adelete_thread(session.thread_id)
+
+
+@asynccontextmanager
+async def _session(graph_name: str, session_id: str | None):
+    """session_id에 해당하는 thread config를 잠금과 함께 제공합니다."""
+    if session_id is None:
+        thread_id = uuid.uuid4().hex
+        try:
+            yield {"configurable": {"thread_id": thread_id}}
+        finally:
+            await graphs[graph_name].checkpointer.adelete_thread(thread_id)
+        return
+
+    key = (graph_name, session_id)
+    if key not in _sessions:
+        _sessions[key] = _Session()
+    session = _sessions[key]
+    _sessions.move_to_end(key)
+    try:
+        async with session.lock:
+            yield {"configurable": {"thread_id": session.thread_id}}
+    finally:
+        session.last_used = time.monotonic()
+        await _evict_sessions()
+
+
+# ====================================
+# ASGI 헬퍼
+# ====================================
+
+async def _read_json(receive) -> dict:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    return json.loads(body or b"{}")
+
+
+async def _send_json(send, status: int, payload: dict) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json; charset=utf-8"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_line(send, payload: dict) -> None:
+    line = json.dumps(payload, ensure_ascii=False) + "\n"
+    await send({"type": "http.response.body", "body": line.encode("utf-8"), "more_body": True})
+
+
+def _active_agent(values: dict):
+    if "active_agent" in values:
+        return values["active_agent"]
+    return getattr(values["messages"][-1], "name", None)
+
+
+# ====================================
+# 핸들러
+# ====================================
+
+async def _invoke(graph_name: str, request: dict, send) -> None:
+    session_id = request.get("session_id")
+    try:
+        async with _session(graph_name, session_id) as config:
+            result = await graphs[graph_name].ainvoke(
+                {"messages": [HumanMessage(content=request["message"])]}, config=config
+            )
+    except Exception as e:
+        logger.exception("graph %s invoke failed", graph_name)
+        await _send_json(send, 500, {"session_id": session_id, "error": f"{type(e).__name__}: {e}"})
+        return
+    await _send_json(send, 200, {
+        "session_id": session_id,
+        "agent": _active_agent(result),
+        "answer": result["messages"][-1].content,
+    })
+
+
+async def _stream(graph_name: str, request: dict, send) -> None:
+    session_id = request.get("session_id")
+    graph = graphs[graph_name]
+
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/x-ndjson; charset=utf-8")],
+    })
+    await _send_line(send, {"type": "session", "session_id": session_id})
+
+    # 상태 코드는 이미 보냈으므로 실행 중 오류는 error 줄로 알리고 응답을 닫음
+    try:
+        async with _session(graph_name, session_id) as config:
+            async for _, (chunk, metadata) in graph.astream(
+                {"messages": [HumanMessage(content=request["message"])]},
+                config=config,
+                stream_mode="messages",
+                subgraphs=True,
+            ):
+                if isinstance(chunk, AIMessageChunk) and chunk.content:
+                    agent = metadata.get("lc_agent_name") or metadata.get("langgraph_node")
+                    await _send_line(send, {"type": "token", "agent": agent, "content": chunk.content})
+            values = (await graph.aget_state(config)).values
+        await _send_line(send, {"type": "end", "agent": _active_agent(values), "answer": values["messages"][-1].content})
+    except Exception as e:
+        logger.exception("graph %s stream failed", graph_name)
+        await _send_line(send, {"type": "error", "error": f"{type(e).__name__}: {e}"})
+    finally:
+        await send({"type": "http.response.body", "body": b""})
+
+
+async def _lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            graphs.update(load_graphs())
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await http_pool.aclose()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    path, method = scope["path"], scope["method"]
+    if method == "GET" and path == "/health":
+        await _send_json(send, 200, {"status": "ok", "graphs": sorted(graphs)})
+        return
+
+    parts = path.strip("/").split("/")
+    if method != "POST" or len(parts) != 3 or parts[0] != "graphs" or parts[2] not in ("invoke", "stream"):
+        await _send_json(send, 404, {"error": "not found"})
+        return
+    graph_name, action = parts[1], parts[2]
+    if graph_name not in graphs:
+        await _send_json(send, 404, {"error": f"unknown graph: {graph_name}"})
+        return
+
+    try:
+        request = await _read_json(receive)
+    except json.JSONDecodeError:
+        await _send_json(send, 400, {"error": "invalid json"})
+        return
+    if not isinstance(request, dict):
+        await _send_json(send, 400, {"error": "request body must be a JSON object"})
+        return
+    if not isinstance(request.get("message"), str) or not request["message"]:
+        await _send_json(send, 400, {"error": "'message' is required"})
+        return
+    if request.get("session_id") is not None and not isinstance(request["session_id"], str):
+        await _send_json(send, 400, {"error": "'session_id' must be a string"})
+        return
+
+    if action == "invoke":
+        await _invoke(graph_name, request, send)
+    else:
+        await _stream(graph_name, request, send)
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host=os.getenv("HOST", "127.0.0.1"), port=int(os.getenv("PORT", "8000")))
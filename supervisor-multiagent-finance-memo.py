@@ -7,9 +7,11 @@ from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.store.memory import InMemoryStore
 from dotenv import load_dotenv
 
+from http_pool import pooled_clients
+
 load_dotenv()
 
-model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+model = ChatOpenAI(model="gpt-4o-mini", temperature=0, **pooled_clients())
 
 checkpointer = InMemorySaver()
 store = InMemoryStore()
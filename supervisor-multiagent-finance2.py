@@ -8,9 +8,12 @@ from langgraph.store.memory import InMemoryStore
 
 from dotenv import load_dotenv
 
+from http_pool import pooled_clients
+from prompt_prefix import PrefixCacheMonitor
+
 load_dotenv()
 
-model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+model = ChatOpenAI(model="gpt-4o-mini", temperature=0, **pooled_clients())
 
 
 # 기존 금융 도구들
@@ -206,11 +209,15 @@ chief_investment_officer = create_supervisor(
 
 # 실행 예제
 if __name__ == "__main__":
+    # 에이전트별 cacheable prefix 길이와 캐시 적중 토큰 비율 집계
+    prefix_monitor = PrefixCacheMonitor()
+    config = {"callbacks": [prefix_monitor]}
+
     # 예제 1: 단순 쿼리 (한 팀만 필요)
     print("=== 예제 1: 단순 주식 정보 조회 ===")
     result1 = chief_investment_officer.invoke({
         "messages": [HumanMessage(content="애플 주식의 현재 정보를 알려주세요.")]
-    })
+    }, config=config)
     print(result1["messages"][-1].content)
     print()
 
@@ -221,7 +228,7 @@ if __name__ == "__main__":
             content="$50,000를 투자했는데 현재 $65,000가 되었습니다. "
                    "수익률을 계산하고, 변동성 0.8, 베타 1.2일 때 위험도를 평가해주세요."
         )]
-    })
+    }, config=config)
     print(result2["messages"][-1].content)
     print()
 
@@ -232,5 +239,9 @@ if __name__ == "__main__":
             content="현재 경제 상황과 기술 섹터 성과를 분석하고, "
                    "중도적 위험 성향 투자자를 위한 투자 전략 보고서를 작성해주세요."
         )]
-    })
-    print(result3["messages"][-1].content)
\ No newline at end of file
+    }, config=config)
+    print(result3["messages"][-1].content)
+    print()
+
+    print("=== prompt prefix 캐시 리포트 ===")
+    prefix_monitor.print_report()
@@ -6,9 +6,12 @@ from langchain_core.messages import HumanMessage
 
 from dotenv import load_dotenv
 
+from http_pool import pooled_clients
+from graph_cache import GraphResultCache
+
 load_dotenv()
 
-model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+model = ChatOpenAI(model="gpt-4o-mini", temperature=0, **pooled_clients())
 
 
 def add(a: float, b: float) -> float:
@@ -19,6 +22,9 @@ def multiply(a: float, b: float) -> float:
     """Multiply two numbers."""
     return a * b
 
+# web_search가 돌려주는 데이터 스냅샷 버전 (데이터가 바뀌면 값을 올려 캐시를 무효화)
+WEB_SEARCH_SNAPSHOT = "2024-faang-headcount"
+
 def web_search(query: str) -> str:
     """Search the web for information."""
     return (
@@ -59,8 +65,16 @@ workflow = create_supervisor(
 
 # Compile and run 
 app = workflow.compile()
-result = app.invoke({"messages": [HumanMessage(content="What is the headcount of Meta in 2024?")]})
 
-print(result["messages"][-1].content)
+# 그래프 전체 결과 캐시: 같은 질문은 supervisor → research_expert → supervisor를 건너뜀
+graph_cache = GraphResultCache(maxsize=256)
+graph_cache.set_source_version("web_search", WEB_SEARCH_SNAPSHOT)
 
+if __name__ == "__main__":
+    result = graph_cache.invoke(app, {"messages": [HumanMessage(content="What is the headcount of Meta in 2024?")]})
+    print(result["messages"][-1].content)
 
+    # 정규화 후 같은 질문이므로 그래프를 실행하지 않고 캐시에서 반환
+    result = graph_cache.invoke(app, {"messages": [HumanMessage(content="  what is the headcount of Meta in 2024 ")]})
+    print(result["messages"][-1].content)
+    print(graph_cache.stats())
@@ -8,11 +8,15 @@ from langchain_core.tools import tool
 from typing import Literal
 from datetime import datetime
 from dotenv import load_dotenv
+import numpy as np
+
+from http_pool import pooled_clients
+from finance_schedule import amortization_schedule, around, compound_schedule, loan_sensitivity, return_sensitivity
 
 load_dotenv()
 
 # AI 모델 설정
-model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+model = ChatOpenAI(model="gpt-4o-mini", temperature=0, **pooled_clients())
 
 # ====================================
 # 1. 간단한 금융 도구들 정의
@@ -20,36 +24,89 @@ model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
 
 @tool
 def calculate_loan_payment(principal: float, annual_rate: float, months: int) -> dict:
-    """대출 월 상환금액을 계산합니다."""
-    # 월 이자율 계산
-    monthly_rate = annual_rate / 100 / 12
-    
-    # 월 상환액 계산 (원리금균등상환)
-    if monthly_rate == 0:
-        monthly_payment = principal / months
-        total_interest = 0
-    else:
-        monthly_payment = principal * (monthly_rate * (1 + monthly_rate)**months) / ((1 + monthly_rate)**months - 1)
-        total_interest = monthly_payment * months - principal
-    
+    """대출 월 상환금액과 연도별 잔액표, 금리·기간별 민감도 표를 계산합니다.
+
+    "5년 후 잔액은?", "금리가 4%면?" 같은 후속 질문은 반환된 표에서 바로 답할 수 있습니다.
+    """
+    if months <= 0:
+        return {"오류": f"대출 기간은 1개월 이상이어야 합니다 (요청: {months})"}
+    # 월별 상환표 (원리금균등상환)
+    schedule = amortization_schedule(principal, annual_rate, months)
+    monthly_payment = schedule["payment"][0]
+    total_interest = schedule["interest"].sum()
+
+    # 연도별 잔액표 (12개월 단위 + 마지막 달)
+    year_ends = np.unique(np.append(np.arange(12, months + 1, 12), months)) - 1
+    paid_principal = np.cumsum(schedule["principal"])[year_ends]
+    paid_interest = np.cumsum(schedule["interest"])[year_ends]
+    yearly = [
+        {
+            "경과_개월": int(schedule["month"][i]),
+            "누적_원금상환": f"{principal_paid:,.0f}원",
+            "누적_이자": f"{interest_paid:,.0f}원",
+            "잔액": f"{schedule['balance'][i]:,.0f}원",
+        }
+        for i, principal_paid, interest_paid in zip(year_ends, paid_principal, paid_interest)
+    ]
+
+    # 금리 ±1%p × 기간(10/20/30년 + 요청 기간) 민감도 표
+    grid = loan_sensitivity(principal, around(annual_rate, 0.5, minimum=0), sorted({120, 240, 360, months}))
+    sensitivity = {
+        f"연 {rate:g}%": {
+            f"{term}개월": f"월 {payment:,.0f}원 / 총이자 {interest:,.0f}원"
+            for term, payment, interest in zip(grid["months"], payments, interests)
+        }
+        for rate, payments, interests in zip(grid["annual_rates"], grid["payment"], grid["total_interest"])
+    }
+
     return {
         "월_상환금액": f"{monthly_payment:,.0f}원",
         "총_이자": f"{total_interest:,.0f}원",
-        "총_상환금액": f"{monthly_payment * months:,.0f}원"
+        "총_상환금액": f"{monthly_payment * months:,.0f}원",
+        "연도별_상환표": yearly,
+        "금리_기간_민감도": sensitivity,
+    }
+
+@tool
+def get_loan_schedule_month(principal: float, annual_rate: float, months: int, month: int) -> dict:
+    """대출 상환표에서 특정 회차(개월)의 상환 내역과 잔액을 조회합니다."""
+    if not 1 <= month <= months:
+        return {"오류": f"회차는 1부터 {months}까지입니다 (요청: {month})"}
+    # 같은 조건의 상환표는 캐시되어 있어 다시 계산하지 않음
+    schedule = amortization_schedule(principal, annual_rate, months)
+    i = month - 1
+    return {
+        "회차": int(schedule["month"][i]),
+        "월_상환금액": f"{schedule['payment'][i]:,.0f}원",
+        "이자": f"{schedule['interest'][i]:,.0f}원",
+        "원금": f"{schedule['principal'][i]:,.0f}원",
+        "잔액": f"{schedule['balance'][i]:,.0f}원",
     }
 
 @tool
 def calculate_investment_return(principal: float, annual_return: float, years: int) -> dict:
-    """복리 투자 수익을 계산합니다."""
-    # 복리 계산
-    final_amount = principal * (1 + annual_return/100)**years
+    """복리 투자 수익과 연도별 평가금액표, 수익률·기간별 민감도 표를 계산합니다."""
+    # 연도별 복리 계산
+    table = compound_schedule(principal, annual_return, years)
+    final_amount = table["value"][-1]
     profit = final_amount - principal
-    
+
+    yearly = {f"{year}년차": f"{value:,.0f}원" for year, value in zip(table["year"][1:], table["value"][1:])}
+
+    # 수익률 ±4%p × 기간(5/10/20/30년 + 요청 기간) 민감도 표
+    grid = return_sensitivity(principal, around(annual_return, 2), sorted({5, 10, 20, 30, years}))
+    sensitivity = {
+        f"연 {rate:g}%": {f"{term}년": f"{amount:,.0f}원" for term, amount in zip(grid["years"], amounts)}
+        for rate, amounts in zip(grid["annual_returns"], grid["final_amount"])
+    }
+
     return {
         "투자원금": f"{principal:,.0f}원",
         "예상수익": f"{profit:,.0f}원",
         "최종금액": f"{final_amount:,.0f}원",
-        "수익률": f"{(profit/principal)*100:.1f}%"
+        "수익률": f"{(profit/principal)*100:.1f}%",
+        "연도별_평가금액": yearly,
+        "수익률_기간_민감도": sensitivity,
     }
 
 @tool
@@ -73,6 +130,7 @@ loan_expert = create_react_agent(
     model,
     tools=[
         calculate_loan_payment,
+        get_loan_schedule_month,
         create_handoff_tool(
             agent_name="InvestmentExpert",
             description="Transfer to investment expert for investment consultation"
@@ -84,6 +142,7 @@ loan_expert = create_react_agent(
     ],
     prompt="""당신은 친절한 대출 전문가입니다.
     대출 상담과 월 상환액 계산을 도와드립니다.
+    상환액 계산 결과의 연도별 상환표와 금리·기간 민감도 표로 답할 수 있는 후속 질문은 도구를 다시 호출하지 말고 표에서 답하세요.
     투자나 계좌 관련 문의는 다른 전문가에게 연결해드립니다.""",
     name="LoanExpert"  # 영문 이름 사용
 )
@@ -104,6 +163,7 @@ investment_expert = create_react_agent(
     ],
     prompt="""당신은 경험 많은 투자 전문가입니다.
     투자 수익률 계산과 투자 상담을 제공합니다.
+    연도별 평가금액과 수익률·기간 민감도 표로 답할 수 있는 후속 질문은 도구를 다시 호출하지 말고 표에서 답하세요.
     대출이나 계좌 관련 문의는 다른 전문가에게 연결해드립니다.""",
     name="InvestmentExpert"  # 영문 이름 사용
 )
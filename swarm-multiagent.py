@@ -7,9 +7,12 @@ from langgraph_swarm import create_swarm, create_handoff_tool
 from langchain_core.messages import HumanMessage
 from dotenv import load_dotenv
 
+from http_pool import pooled_clients
+from budget_governor import StepBudget, governed_invoke
+
 load_dotenv()
 
-model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+model = ChatOpenAI(model="gpt-4o-mini", temperature=0, **pooled_clients())
 
 
 def add(a: int, b: int) -> int:
@@ -50,13 +53,16 @@ app = workflow.compile(checkpointer=checkpointer)
 
 config = {"configurable": {"thread_id":"101"}}
 
-turn_1 = app.invoke({"messages": [HumanMessage(content="i`d like to speak to Bob")]},config=config)
+# Alice ↔ Bob 핸드오프가 끝없이 반복되지 않도록 요청 단위 예산 적용
+budget = StepBudget(max_steps=20, max_llm_calls=8, max_handoff_repeats=2)
+
+turn_1 = governed_invoke(app, {"messages": [HumanMessage(content="i`d like to speak to Bob")]}, config=config, budget=budget, model=model)
 
 print(turn_1)
 print()
 print(turn_1["messages"][-1].content)
 
 
-# turn_2 = app.invoke({"messages": [HumanMessage(content="what`s 5+7")]},config=config)
+# turn_2 = governed_invoke(app, {"messages": [HumanMessage(content="what`s 5+7")]}, config=config, budget=budget, model=model)
 
 # print(turn_2)
\ No newline at end of file